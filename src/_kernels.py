@@ -0,0 +1,199 @@
+"""JIT-compiled geometry kernels for the hot polygon builders.
+
+numba is optional: when it is not installed, the kernels run as plain
+Python functions with the exact same signatures.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba not installed, fall back to pure Python
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def chain_points(start_x: float, start_y: float, lengths, angles) -> np.ndarray:
+    """Compute the points of a chain of lines starting at (start_x, start_y).
+
+    Line i has length lengths[i] and angle angles[i] in degrees.
+
+    Args:
+        start_x (float): x coordinate of the starting point
+        start_y (float): y coordinate of the starting point
+        lengths: length of each line of the chain
+        angles: angle of each line in degrees
+
+    Returns:
+        np.ndarray: array of shape (len(lengths) + 1, 2) with the starting
+            point followed by the end point of each line
+    """
+    count = lengths.shape[0]
+    points = np.empty((count + 1, 2), dtype=np.float64)
+    points[0, 0] = start_x
+    points[0, 1] = start_y
+    for i in range(count):
+        radian = math.radians(angles[i])
+        points[i + 1, 0] = points[i, 0] + lengths[i] * math.cos(radian)
+        points[i + 1, 1] = points[i, 1] + lengths[i] * math.sin(radian)
+    return points
+
+
+@njit(cache=True, fastmath=True)
+def beam_chain_points(
+    start_x: float,
+    start_y: float,
+    branch_angle: float,
+    side_angle: float,
+    beam_count: int,
+    beam_length: float,
+    beam_gap: float,
+    half_beam_width: float,
+) -> np.ndarray:
+    """Compute the vertices of every beam of one branch side.
+
+    Args:
+        start_x (float): x coordinate of the first beam starting point
+        start_y (float): y coordinate of the first beam starting point
+        branch_angle (float): angle of the branch in degrees
+        side_angle (float): angle of the beam side in degrees (branch_angle +- 90)
+        beam_count (int): number of beams in the branch
+        beam_length (float): beam length
+        beam_gap (float): gap between beams in a branch
+        half_beam_width (float): (beam_width - panel_gap) / 2
+
+    Returns:
+        np.ndarray: array of shape (4 * beam_count, 2) with the starting
+            point followed by the vertices of the beam chain
+    """
+    count = 4 * beam_count - 1
+    lengths = np.empty(count, dtype=np.float64)
+    angles = np.empty(count, dtype=np.float64)
+    k = 0
+    for i in range(beam_count):
+        lengths[k] = half_beam_width
+        angles[k] = side_angle
+        lengths[k + 1] = beam_length
+        angles[k + 1] = branch_angle
+        lengths[k + 2] = half_beam_width
+        angles[k + 2] = side_angle + 180.0
+        k += 3
+        if i < beam_count - 1:
+            lengths[k] = beam_gap
+            angles[k] = branch_angle
+            k += 1
+    return chain_points(start_x, start_y, lengths, angles)
+
+
+@njit(cache=True, fastmath=True)
+def shim_branch_points(
+    start_x: float,
+    start_y: float,
+    angle: float,
+    extremity_length: float,
+    half_beam_width: float,
+    margin: float,
+    width: float,
+) -> np.ndarray:
+    """Compute the 8 vertices of the shim branch outline.
+
+    Args:
+        start_x (float): x coordinate of the branch starting point
+        start_y (float): y coordinate of the branch starting point
+        angle (float): angle of the branch in degrees
+        extremity_length (float): length of the extremity of the shim
+        half_beam_width (float): (beam_width - panel_gap) / 2
+        margin (float): margin of the shim
+        width (float): width of the shim
+
+    Returns:
+        np.ndarray: array of shape (8, 2) with the outline vertices
+    """
+    lengths = np.array(
+        [
+            extremity_length,
+            half_beam_width,
+            margin,
+            width,
+            margin,
+            half_beam_width,
+            extremity_length,
+        ]
+    )
+    angles = np.array(
+        [
+            angle,
+            angle - 90.0,
+            angle,
+            angle + 90.0,
+            angle + 180.0,
+            angle - 90.0,
+            angle - 180.0,
+        ]
+    )
+    return chain_points(start_x, start_y, lengths, angles)
+
+
+@njit(cache=True, fastmath=True)
+def shim_separator_points(
+    start_x: float,
+    start_y: float,
+    angle: float,
+    half_beam_width: float,
+    margin: float,
+    width: float,
+    beam_gap: float,
+) -> np.ndarray:
+    """Compute the 13 vertices of the shim separator outline.
+
+    Args:
+        start_x (float): x coordinate of the separator starting point
+        start_y (float): y coordinate of the separator starting point
+        angle (float): angle of the separator in degrees
+        half_beam_width (float): (beam_width - panel_gap) / 2
+        margin (float): margin of the shim
+        width (float): width of the shim
+        beam_gap (float): gap between beams in a branch
+
+    Returns:
+        np.ndarray: array of shape (13, 2) with the outline vertices
+    """
+    lengths = np.array(
+        [
+            width / 2,
+            margin,
+            half_beam_width,
+            beam_gap - margin,
+            half_beam_width,
+            margin,
+            width,
+            margin,
+            half_beam_width,
+            beam_gap - margin,
+            half_beam_width,
+            margin,
+        ]
+    )
+    angles = np.array(
+        [
+            angle + 90.0,
+            angle,
+            angle - 90.0,
+            angle,
+            angle + 90.0,
+            angle,
+            angle - 90.0,
+            angle + 180.0,
+            angle + 90.0,
+            angle + 180.0,
+            angle - 90.0,
+            angle + 180.0,
+        ]
+    )
+    return chain_points(start_x, start_y, lengths, angles)
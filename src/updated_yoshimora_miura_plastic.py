@@ -1,9 +1,13 @@
-import math
 from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 from dxfwrite import DXFEngine as dxf
 
 from utils import (
+    add_entities,
+    cos_sin,
     end_point_of_line,
     normalize_vector,
     vector_difference,
@@ -21,12 +25,12 @@ class BuildingBlockUpdatedYoshimora:
         length: float,
         angle: float,
         beam_count: int,
-        activated_branch=[True for _ in range(8)],
+        activated_branch=None,
         panel_gap=1.2,
         beam_gap=2.33,
         beam_length=6.33,
         beam_width=4.83,
-        drawing=dxf.drawing("yoshimura_pattern.dxf"),
+        drawing=None,
         tape=False,
         *args,
         **kwargs,
@@ -36,14 +40,18 @@ class BuildingBlockUpdatedYoshimora:
         self.length = length
         self.angle = angle
         self.beam_count = beam_count
-        self.activated_branch = activated_branch
+        if activated_branch is None:
+            activated_branch = (True,) * 8
+        self.activated_branch = tuple(activated_branch)
         self.panel_gap = panel_gap
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimura_pattern.dxf")
         self.drawing = drawing
         self.tape = tape
-        self.angles = [
+        self.angles = (
             0,
             self.angle,
             90,
@@ -52,7 +60,18 @@ class BuildingBlockUpdatedYoshimora:
             180 + self.angle,
             -90,
             -self.angle,
-        ]
+        )
+        cos_a, sin_a = cos_sin(self.angle)
+        span = self.length + 2 * self.radius
+        # branches 0/4 are horizontal, 2/6 vertical, the rest diagonal
+        self._branch_lengths = tuple(
+            cos_a * span - self.radius
+            if i in (0, 4)
+            else sin_a * span - self.radius
+            if i in (2, 6)
+            else self.length
+            for i in range(8)
+        )
 
     def _compute_branch_position(self) -> list[tuple[float]]:
         """Compute the position of the branches
@@ -71,16 +90,7 @@ class BuildingBlockUpdatedYoshimora:
         Returns:
             float: length of the horizontal branch
         """
-        if idx == 0 or idx == 4:
-            return (
-                math.cos(math.radians(self.angle)) * (self.length + 2 * self.radius)
-            ) - self.radius
-        elif idx == 2 or idx == 6:
-            return (
-                math.sin(math.radians(self.angle)) * (self.length + 2 * self.radius)
-            ) - self.radius
-        else:
-            return self.length
+        return self._branch_lengths[idx]
 
     def _create_branch(
         self, position: tuple[float], length: float, angle: float
@@ -120,12 +130,17 @@ class BuildingBlockUpdatedYoshimora:
                 drawing=self.drawing,
             )
 
-    def _draw_branch_center_support(self, position: tuple[float], angle: float) -> None:
-        """Draw the center support of the branch useful for the manufacturing
+    def _collect_center_support_entities(
+        self, position: tuple[float], angle: float
+    ) -> list[tuple[str, list[tuple[float]]]]:
+        """Compute the center support of the branch useful for the manufacturing
 
         Args:
             position (tuple[float]): position of the branch
             angle (float): angle of the branch
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line", points) pairs
         """
         start_point_extremity1 = end_point_of_line(
             position, self.panel_gap / 2, angle - 90
@@ -137,7 +152,6 @@ class BuildingBlockUpdatedYoshimora:
             start_point_extremity1,
             vector_multiply(dir_vector1, self.radius / 2),
         )
-        self.drawing.add(dxf.line(start_point_extremity1, second_point_extremity1))
 
         start_point_extremity2 = end_point_of_line(
             position, self.panel_gap / 2, angle + 90
@@ -149,12 +163,19 @@ class BuildingBlockUpdatedYoshimora:
             start_point_extremity2,
             vector_multiply(dir_vector2, self.radius / 2),
         )
-        self.drawing.add(dxf.line(start_point_extremity2, second_point_extremity2))
-        self.drawing.add(dxf.line(second_point_extremity1, second_point_extremity2))
-        self.drawing.save()
+        return [
+            ("line", (start_point_extremity1, second_point_extremity1)),
+            ("line", (start_point_extremity2, second_point_extremity2)),
+            ("line", (second_point_extremity1, second_point_extremity2)),
+        ]
 
-    def _draw_building_block(self) -> None:
-        """Draw the building block with the given parameters"""
+    def _collect_entities(self) -> list[tuple[str, list[tuple[float]]]]:
+        """Compute the entities of the building block without drawing them
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line" | "polyline", points) pairs
+        """
+        entities = []
         branch_positions = self._compute_branch_position()
         for i, branch_state in enumerate(self.activated_branch):
             if branch_state:  # branch is activated
@@ -163,19 +184,23 @@ class BuildingBlockUpdatedYoshimora:
                 branch = self._create_branch(
                     branch_positions[i], length, self.angles[i]
                 )  # create the i-th branch
-                branch()  # draw the branch
+                entities += branch._collect_entities()
 
             if not self.tape:
-                self._draw_branch_center_support(
+                entities += self._collect_center_support_entities(
                     branch_positions[i], self.angles[i]
-                )  # draw the center support
+                )  # center support of the branch
+        return entities
 
+    def _draw_building_block(self) -> None:
+        """Draw the building block with the given parameters"""
+        add_entities(self.drawing, self._collect_entities())
         if self.tape:
             self.drawing.add(dxf.circle(self.radius, self.center))
-            self.drawing.save()
 
     def __call__(self) -> None:
         self._draw_building_block()
+        self.drawing.save()
 
 
 class YoshimoraUpdatedTesselation:
@@ -191,8 +216,9 @@ class YoshimoraUpdatedTesselation:
         beam_gap=2.33,
         beam_length=6.33,
         beam_width=4.83,
-        drawing=dxf.drawing("yoshimura_pattern.dxf"),
+        drawing=None,
         tape=False,
+        workers=None,
         *args,
         **kwargs,
     ) -> None:
@@ -211,10 +237,11 @@ class YoshimoraUpdatedTesselation:
             beam_width (float, optional): beam width (Defaults to 4.83, see README for more schematic)
             drawing (_type_, optional): dxf object (Defaults to dxf.drawing("yoshimura_pattern.dxf"))
             tape (bool, optional): tape tesselation or not (Defaults to False)
+            workers (int, optional): number of processes used to compute the
+                block geometry in parallel (Defaults to None, serial)
         """
-        assert (type(size) == tuple) and (
-            len(size) == 2
-        ), "Size must be a tuple of 2 integers"
+        if not isinstance(size, tuple) or len(size) != 2:
+            raise TypeError("Size must be a tuple of 2 integers")
         self.size = size
         self.center = center
         self.radius = radius
@@ -225,8 +252,36 @@ class YoshimoraUpdatedTesselation:
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimura_pattern.dxf")
         self.drawing = drawing
         self.tape = tape
+        self.workers = workers
+        cos_a, sin_a = cos_sin(self.angle)
+        span = self.length + 2 * self.radius
+        self._row_offset = span * cos_a  # x shift of even rows
+        self._column_step = 2 * cos_a * span
+        self._row_step = -span * sin_a
+        self._centers = self._build_center_grid()
+
+    def _build_center_grid(self) -> np.ndarray:
+        """Compute the centers of every building block of the grid at once.
+
+        The centers are affine in the block indices, so the whole grid is a
+        single broadcasted expression over the row/column ranges.
+
+        Returns:
+            np.ndarray: array of shape (size[0], size[1], 2) with the centers
+        """
+        rows = np.arange(self.size[0])[:, None]
+        columns = np.arange(self.size[1])[None, :]
+        x = (
+            self.center[0]
+            + columns * self._column_step
+            + np.where(rows % 2 == 0, self._row_offset, 0.0)
+        )
+        y = self.center[1] + rows * self._row_step
+        return np.stack(np.broadcast_arrays(x, y), axis=-1)
 
     def _get_activated_branch(self, position: tuple[int]) -> list[bool]:
         """Choose which branch to activate based on the position of the building block to avoid overlapping
@@ -274,47 +329,53 @@ class YoshimoraUpdatedTesselation:
         Returns:
             tuple[float]: center of the building block
         """
-        if position[0] % 2 == 0:
-            offset = end_point_of_line(
-                (0, 0), 2 * self.radius + self.length, self.angle
-            )[0]
-        else:
-            offset = 0
+        return tuple(self._centers[position[0], position[1]])
 
-        vertical_mov = end_point_of_line(
-            self.center, position[0] * (2 * self.radius + self.length), -self.angle
-        )
-        horizontal_mov = end_point_of_line(
-            self.center,
-            position[1]
-            * 2
-            * math.cos(math.radians(self.angle))
-            * (self.length + 2 * self.radius),
-            0,
+    def _build_block(self, position: tuple[int]) -> BuildingBlockUpdatedYoshimora:
+        """Create the building block of one grid cell
+
+        Args:
+            position (tuple[int]): coordinates (index) of the building block
+
+        Returns:
+            BuildingBlockUpdatedYoshimora: block ready to be drawn
+        """
+        return BuildingBlockUpdatedYoshimora(
+            center=self._get_block_center(position),
+            radius=self.radius,
+            length=self.length,
+            angle=self.angle,
+            beam_count=self.beam_count,
+            activated_branch=self._get_activated_branch(position),
+            panel_gap=self.panel_gap,
+            beam_gap=self.beam_gap,
+            beam_length=self.beam_length,
+            beam_width=self.beam_width,
+            drawing=self.drawing,
+            tape=self.tape,
         )
-        return horizontal_mov[0] + offset, vertical_mov[1]
 
     def _draw_tesselation(self) -> None:
         """Draw the tesselation given the parameters"""
-        for i in range(self.size[0]):
-            for j in range(self.size[1]):
-                center = self._get_block_center((i, j))
-                activated_branch = self._get_activated_branch((i, j))
-                yoshimora_block = BuildingBlockUpdatedYoshimora(
-                    center=center,
-                    radius=self.radius,
-                    length=self.length,
-                    angle=self.angle,
-                    beam_count=self.beam_count,
-                    activated_branch=activated_branch,
-                    panel_gap=self.panel_gap,
-                    beam_gap=self.beam_gap,
-                    beam_length=self.beam_length,
-                    beam_width=self.beam_width,
-                    drawing=self.drawing,
-                    tape=self.tape,
+        blocks = [
+            self._build_block((i, j))
+            for i in range(self.size[0])
+            for j in range(self.size[1])
+        ]
+        if self.workers is not None and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                entity_lists = list(
+                    pool.map(BuildingBlockUpdatedYoshimora._collect_entities, blocks)
                 )
-                yoshimora_block()
+            for entities in entity_lists:
+                add_entities(self.drawing, entities)
+            if self.tape:
+                for block in blocks:
+                    self.drawing.add(dxf.circle(self.radius, block.center))
+        else:
+            for block in blocks:
+                block._draw_building_block()
+        self.drawing.save()
 
     def __call__(self):
         self._draw_tesselation()
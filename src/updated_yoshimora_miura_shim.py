@@ -1,9 +1,12 @@
 from typing import Any
 from dxfwrite import DXFEngine as dxf
+import numpy as np
 from utils import (
+    cos_sin,
     end_point_of_line,
+    rotation_table,
 )
-import math
+from _kernels import shim_separator_points
 from yoshimora_miura_shim import ShimBranch
 
 
@@ -19,10 +22,10 @@ class ShimCenterPart:
         beam_count: int,
         panel_gap: 1.2,
         beam_gap: 2.2,
-        activated_branch=[True for _ in range(8)],
+        activated_branch=None,
         beam_length=6.33,
         beam_width=4.33,
-        drawing=dxf.drawing("yoshimora_shim.dxf"),
+        drawing=None,
         *args,
         **kwargs,
     ) -> None:
@@ -35,11 +38,15 @@ class ShimCenterPart:
         self.beam_count = beam_count
         self.panel_gap = panel_gap
         self.beam_gap = beam_gap
-        self.activated_branch = activated_branch
+        if activated_branch is None:
+            activated_branch = (True,) * 8
+        self.activated_branch = tuple(activated_branch)
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimora_shim.dxf")
         self.drawing = drawing
-        self.angles = [
+        self.angles = (
             0,
             self.angle,
             90,
@@ -48,40 +55,46 @@ class ShimCenterPart:
             180 + self.angle,
             -90,
             -self.angle,
-        ]
+        )
+        cos_a, sin_a = cos_sin(self.angle)
+        span = self.length + 2 * self.radius
+        # branches 0/4 are horizontal, 2/6 vertical, the rest diagonal
+        self._branch_lengths = tuple(
+            cos_a * span - self.radius
+            if i in (0, 4)
+            else sin_a * span - self.radius
+            if i in (2, 6)
+            else self.length
+            for i in range(8)
+        )
         self.width = self.beam_width * 1 / self.ratio
+        self._branch_positions = None
 
     def _get_branch_position(self) -> list[tuple[float]]:
         """Compute the position of the branches of the shim
 
+        The chain of perpendicular offsets is a prefix sum, so all eight
+        positions come from one vectorized pass over the angle table; the
+        result is cached since the positions never change per instance.
+
         Returns:
             list[tuple[float]]: _description_
         """
-        branch_positions = []
-        for i, angle in enumerate(self.angles):
-            point = end_point_of_line(self.center, self.radius, angle)
-            for j in range(i):
-                if j == 0:
-                    point = end_point_of_line(
-                        point,
-                        (self.beam_width * 1 / self.ratio - self.beam_width) / 2,
-                        self.angles[j] + 90,
-                    )
-                else:
-                    point = end_point_of_line(
-                        point,
-                        self.beam_width * 1 / self.ratio - self.beam_width,
-                        self.angles[j] + 90,
-                    )
-            if i != 0:
-                point = end_point_of_line(
-                    point,
-                    self.panel_gap / 2
-                    - (self.width - self.beam_width + self.panel_gap) / 2,
-                    self.angles[i] - 90,
-                )
-            branch_positions.append(point)
-        return branch_positions
+        if self._branch_positions is None:
+            table = rotation_table(self.angles)
+            steps = np.full(len(self.angles), self.width - self.beam_width)
+            steps[0] /= 2
+            cumulative = np.cumsum(steps[:, None] * table[:, 1], axis=0)
+            shift = (
+                self.panel_gap / 2
+                - (self.width - self.beam_width + self.panel_gap) / 2
+            )
+            points = (
+                np.asarray(self.center, dtype=np.float64) + self.radius * table[:, 0]
+            )
+            points[1:] += cumulative[:-1] + shift * table[1:, 2]
+            self._branch_positions = [tuple(point) for point in points]
+        return self._branch_positions
 
     def _get_branch_length(self, idx: int) -> float:
         """Compute the length of the horizontal branch of the building block
@@ -89,16 +102,7 @@ class ShimCenterPart:
         Returns:
             float: length of the horizontal branch
         """
-        if idx == 0 or idx == 4:
-            return (
-                math.cos(math.radians(self.angle)) * (self.length + 2 * self.radius)
-            ) - self.radius
-        elif idx == 2 or idx == 6:
-            return (
-                math.sin(math.radians(self.angle)) * (self.length + 2 * self.radius)
-            ) - self.radius
-        else:
-            return self.length
+        return self._branch_lengths[idx]
 
     def _draw_shim(self):
         branch_position = self._get_branch_position()
@@ -132,7 +136,6 @@ class ShimCenterPart:
                 ),
             )
         )  # draw the last join between the branches
-        self.drawing.save()
 
     def __call__(self):
         self._draw_shim()
@@ -149,7 +152,7 @@ class ShimSep:
         beam_gap: 2.2,
         beam_length=6.33,
         beam_width=4.33,
-        drawing=dxf.drawing("yoshimora_shim.dxf"),
+        drawing=None,
         *args,
         **kwargs,
     ):
@@ -161,62 +164,35 @@ class ShimSep:
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimora_shim.dxf")
         self.drawing = drawing
         self.width = self.beam_width * 1 / self.ratio
 
-    def _get_seperator_points(self) -> list[tuple[float]]:
+    def _get_seperator_points(self) -> np.ndarray:
         """Get the points of the shim seperator
 
         Returns:
-            list[tuple[float]]: points of the shim seperator
+            np.ndarray: array of shape (13, 2) with the seperator points
         """
         start_point = end_point_of_line(
             self.center, (self.beam_gap + self.margin) / 2, self.angle + 180
         )
-        point1 = end_point_of_line(start_point, self.width / 2, self.angle + 90)
-        point2 = end_point_of_line(point1, self.margin, self.angle)
-        point3 = end_point_of_line(
-            point2, (self.beam_width - self.panel_gap) / 2, self.angle - 90
-        )
-        point4 = end_point_of_line(point3, self.beam_gap - self.margin, self.angle)
-        point5 = end_point_of_line(
-            point4, (self.beam_width - self.panel_gap) / 2, self.angle + 90
-        )
-        point6 = end_point_of_line(point5, self.margin, self.angle)
-        point7 = end_point_of_line(point6, self.width, self.angle - 90)
-        point8 = end_point_of_line(point7, self.margin, self.angle + 180)
-        point9 = end_point_of_line(
-            point8, (self.beam_width - self.panel_gap) / 2, self.angle + 90
-        )
-        point10 = end_point_of_line(
-            point9, self.beam_gap - self.margin, self.angle + 180
-        )
-        point11 = end_point_of_line(
-            point10, (self.beam_width - self.panel_gap) / 2, self.angle - 90
+        return shim_separator_points(
+            start_point[0],
+            start_point[1],
+            self.angle,
+            (self.beam_width - self.panel_gap) / 2,
+            self.margin,
+            self.width,
+            self.beam_gap,
         )
-        point12 = end_point_of_line(point11, self.margin, self.angle + 180)
-        return [
-            start_point,
-            point1,
-            point2,
-            point3,
-            point4,
-            point5,
-            point6,
-            point7,
-            point8,
-            point9,
-            point10,
-            point11,
-            point12,
-        ]
 
     def _draw_shim_seperator(self) -> None:
         """Draw the shim seperator"""
         points = self._get_seperator_points()[1:]
-        points.append(points[0])  # close the loop
-        self.drawing.add(dxf.polyline(points))
-        self.drawing.save()
+        points = np.vstack([points, points[:1]])  # close the loop
+        self.drawing.add(dxf.polyline(points.tolist()))
 
     def __call__(self):
         self._draw_shim_seperator()
@@ -234,10 +210,10 @@ class BuildingBlockShimYoshimora:
         beam_count: int,
         panel_gap: 1.2,
         beam_gap: 2.2,
-        activated_branch=[True for _ in range(8)],
+        activated_branch=None,
         beam_length=6.33,
         beam_width=4.33,
-        drawing=dxf.drawing("yoshimora_shim.dxf"),
+        drawing=None,
         *args,
         **kwargs,
     ) -> None:
@@ -250,11 +226,15 @@ class BuildingBlockShimYoshimora:
         self.beam_count = beam_count
         self.panel_gap = panel_gap
         self.beam_gap = beam_gap
-        self.activated_branch = activated_branch
+        if activated_branch is None:
+            activated_branch = (True,) * 8
+        self.activated_branch = tuple(activated_branch)
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimora_shim.dxf")
         self.drawing = drawing
-        self.angles = [
+        self.angles = (
             0,
             self.angle,
             90,
@@ -263,40 +243,47 @@ class BuildingBlockShimYoshimora:
             180 + self.angle,
             -90,
             -self.angle,
-        ]
+        )
+        cos_a, sin_a = cos_sin(self.angle)
+        span = self.length + 2 * self.radius
+        # branches 0/4 are horizontal, 2/6 vertical, the rest diagonal
+        self._branch_lengths = tuple(
+            cos_a * span - self.radius
+            if i in (0, 4)
+            else sin_a * span - self.radius
+            if i in (2, 6)
+            else self.length
+            for i in range(8)
+        )
         self.width = self.beam_width * 1 / self.ratio
+        self._branch_positions = None
+        self._rot_table = rotation_table(self.angles)
 
     def _get_branch_position(self) -> list[tuple[float]]:
         """Compute the position of the branches of the shim
 
+        The chain of perpendicular offsets is a prefix sum, so all eight
+        positions come from one vectorized pass over the angle table; the
+        result is cached since the positions never change per instance.
+
         Returns:
             list[tuple[float]]: _description_
         """
-        branch_positions = []
-        for i, angle in enumerate(self.angles):
-            point = end_point_of_line(self.center, self.radius, angle)
-            for j in range(i):
-                if j == 0:
-                    point = end_point_of_line(
-                        point,
-                        (self.beam_width * 1 / self.ratio - self.beam_width) / 2,
-                        self.angles[j] + 90,
-                    )
-                else:
-                    point = end_point_of_line(
-                        point,
-                        self.beam_width * 1 / self.ratio - self.beam_width,
-                        self.angles[j] + 90,
-                    )
-            if i != 0:
-                point = end_point_of_line(
-                    point,
-                    self.panel_gap / 2
-                    - (self.width - self.beam_width + self.panel_gap) / 2,
-                    self.angles[i] - 90,
-                )
-            branch_positions.append(point)
-        return branch_positions
+        if self._branch_positions is None:
+            table = rotation_table(self.angles)
+            steps = np.full(len(self.angles), self.width - self.beam_width)
+            steps[0] /= 2
+            cumulative = np.cumsum(steps[:, None] * table[:, 1], axis=0)
+            shift = (
+                self.panel_gap / 2
+                - (self.width - self.beam_width + self.panel_gap) / 2
+            )
+            points = (
+                np.asarray(self.center, dtype=np.float64) + self.radius * table[:, 0]
+            )
+            points[1:] += cumulative[:-1] + shift * table[1:, 2]
+            self._branch_positions = [tuple(point) for point in points]
+        return self._branch_positions
 
     def _get_offset_length(self, length) -> float:
         """Compute the offset length of the shim
@@ -321,34 +308,30 @@ class BuildingBlockShimYoshimora:
         Returns:
             float: length of the horizontal branch
         """
-        if idx == 0 or idx == 4:
-            return (
-                math.cos(math.radians(self.angle)) * (self.length + 2 * self.radius)
-            ) - self.radius
-        elif idx == 2 or idx == 6:
-            return (
-                math.sin(math.radians(self.angle)) * (self.length + 2 * self.radius)
-            ) - self.radius
-        else:
-            return self.length
+        return self._branch_lengths[idx]
 
-    def _get_seperator_center(
-        self, idx: int, count: int, offset: float, branch_position: tuple[float]
-    ) -> tuple[float]:
-        """Compute the center of the shim seperator
+    def _get_seperator_centers(
+        self, idx: int, offset: float, branch_position: tuple[float]
+    ) -> np.ndarray:
+        """Compute the centers of every shim seperator of one branch
+
+        The seperators are evenly spaced along the branch, so all the
+        centers are computed in one vectorized expression.
 
         Args:
-            count (int): count of the beam
+            idx (int): index of the branch
             offset (float): offset of the shim
             branch_position (tuple[float]): position of the branch
 
         Returns:
-            tuple[float]: center of the shim seperator
+            np.ndarray: array of shape (beam_count - 1, 2) with the centers
         """
-        return end_point_of_line(
-            branch_position,
-            offset + count * (self.beam_gap + self.beam_length),
-            self.angles[idx],
+        distances = offset + np.arange(self.beam_count - 1) * (
+            self.beam_gap + self.beam_length
+        )
+        return (
+            np.asarray(branch_position, dtype=np.float64)
+            + distances[:, None] * self._rot_table[idx, 0]
         )
 
     def _draw_shim(self) -> None:
@@ -370,16 +353,15 @@ class BuildingBlockShimYoshimora:
         center_shim()  # draw the center part of the shim
         branch_position = center_shim._get_branch_position()
         for i, branch_state in enumerate(self.activated_branch):
+            if not branch_state:
+                continue
             length = self._get_branch_length(i)
             offset = self._get_offset_length(length)
-            for count in range(self.beam_count - 1):
-                if not branch_state:
-                    continue
-                center_sep = self._get_seperator_center(
-                    i, count, offset, branch_position[i]
-                )
+            for center_sep in self._get_seperator_centers(
+                i, offset, branch_position[i]
+            ):
                 shim_sep = ShimSep(
-                    center_sep,
+                    tuple(center_sep),
                     self.angles[i],
                     self.ratio,
                     self.margin,
@@ -393,6 +375,7 @@ class BuildingBlockShimYoshimora:
 
     def __call__(self):
         self._draw_shim()
+        self.drawing.save()
 
 
 class ShimTesselation:
@@ -410,7 +393,7 @@ class ShimTesselation:
         beam_gap=2.33,
         beam_length=6.33,
         beam_width=4.83,
-        drawing=dxf.drawing("shim.dxf"),
+        drawing=None,
         *args,
         **kwargs,
     ) -> None:
@@ -426,6 +409,8 @@ class ShimTesselation:
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("shim.dxf")
         self.drawing = drawing
         self.width = self.beam_width * 1 / self.ratio
         self.angles = [
@@ -436,6 +421,15 @@ class ShimTesselation:
             180 + self.angle,
             -self.angle,
         ]
+        # closed-form offset from a branch end point back to the center of
+        # the block that starts there, one row per branch index
+        table = rotation_table(self.angles)
+        steps = np.full(len(self.angles), self.width - self.beam_width)
+        steps[0] /= 2
+        cumulative = np.cumsum(steps[:, None] * table[:, 1], axis=0)
+        shift = self.panel_gap / 2 - (self.width - self.beam_width + self.panel_gap) / 2
+        self._center_offsets = shift * table[:, 1] - self.radius * table[:, 0]
+        self._center_offsets[1:] -= cumulative[:-1]
 
     def _compute_activated_branch(self, position: tuple[int]) -> list[bool]:
         activated_branch = [True] * 6
@@ -465,38 +459,22 @@ class ShimTesselation:
     def _get_center_position(
         self, branch_number: int, branch_position: tuple[float]
     ) -> tuple[float]:
-        point = end_point_of_line(
-            branch_position,
-            (self.width - self.beam_width + self.panel_gap) / 2,
-            self.angles[branch_number] - 90,
+        """Compute the center of the block whose branch ends at a point
+
+        The walk back from the branch end point is a fixed linear offset
+        per branch index, precomputed in __init__.
+
+        Args:
+            branch_number (int): index of the branch
+            branch_position (tuple[float]): end point of the branch
+
+        Returns:
+            tuple[float]: center of the adjacent block
+        """
+        return tuple(
+            np.asarray(branch_position, dtype=np.float64)
+            + self._center_offsets[branch_number]
         )
-        if branch_position == 0:
-            point = end_point_of_line(
-                point,
-                (self.width - self.beam_width + self.panel_gap) / 2,
-                self.angles[branch_number] + 90,
-            )
-        else:
-            point = end_point_of_line(
-                point,
-                self.panel_gap / 2,
-                self.angles[branch_number] + 90,
-            )
-        for i in list(range(0, branch_number))[::-1]:
-            if i == 0:
-                point = end_point_of_line(
-                    point,
-                    (self.beam_width * 1 / self.ratio - self.beam_width) / 2,
-                    self.angles[i] + 270,
-                )
-            else:
-                point = end_point_of_line(
-                    point,
-                    self.beam_width * 1 / self.ratio - self.beam_width,
-                    self.angles[i] + 270,
-                )
-        point = end_point_of_line(point, self.radius, self.angles[branch_number] + 180)
-        return point
 
     def _get_new_ref_block(
         self, row_idx: int, old_ref_block: BuildingBlockShimYoshimora
@@ -553,7 +531,7 @@ class ShimTesselation:
                 self.beam_width,
                 self.drawing,
             )
-            buildingBlockShim()
+            buildingBlockShim._draw_shim()
             center = end_point_of_line(
                 center, buildingBlockShim._get_branch_length(0) + self.radius, 0
             )
@@ -578,6 +556,7 @@ class ShimTesselation:
         for i in range(self.size[0]):
             self._draw_row(i, ref_block.center, self.size[1])
             ref_block = self._get_new_ref_block(i + 1, ref_block)
+        self.drawing.save()
 
     def __call__(self) -> None:
         self._draw_shim_sheet()
@@ -1,11 +1,56 @@
+import functools
 import math
 
+import numpy as np
+from dxfwrite import DXFEngine as dxf
+
+
+def add_entities(drawing, entities) -> None:
+    """Emit collected (kind, points) entities into the drawing.
+
+    Points may be an (N, 2) NumPy array; the conversion to Python lists
+    happens here, at the dxfwrite boundary, with a single .tolist() call.
+
+    Args:
+        drawing: dxfwrite drawing to add the entities to
+        entities: list of ("line" | "polyline", points) pairs
+    """
+    add = drawing.add
+    line, polyline = dxf.line, dxf.polyline
+    for kind, points in entities:
+        if isinstance(points, np.ndarray):
+            points = points.tolist()
+        if kind == "line":
+            add(line(points[0], points[1]))
+        else:
+            add(polyline(points))
+
+
+@functools.lru_cache(maxsize=256)
+def cos_sin(angle: float) -> tuple[float]:
+    """Compute and memoize the cosine and sine of an angle in degrees.
+
+    The generator reuses the same handful of branch angles millions of
+    times, so the trig pair is cached per distinct angle.
+
+    Args:
+        angle (float): angle in degrees
+
+    Returns:
+        tuple[float]: (cos, sin) of the angle
+    """
+    radian = math.radians(angle)
+    return (math.cos(radian), math.sin(radian))
+
 
 def end_point_of_line(
     starting_point: tuple[float], length: float, angle: float
 ) -> tuple[float]:
     """Compute the end point of a line given the starting point, length, and angle.
 
+    Quadrant angles (0, 90, 180, 270) are handled without any trig call;
+    other angles go through the memoized cos/sin pair.
+
     Args:
         starting_point (tuple[float]): coordinates of the starting point
         length (float): length of the line
@@ -14,58 +59,92 @@ def end_point_of_line(
     Returns:
         tuple[float]: _description_
     """
-    x = starting_point[0] + length * math.cos(math.radians(angle))
-    y = starting_point[1] + length * math.sin(math.radians(angle))
-    return (x, y)
+    angle = angle % 360
+    if angle == 0:
+        return (starting_point[0] + length, starting_point[1])
+    if angle == 90:
+        return (starting_point[0], starting_point[1] + length)
+    if angle == 180:
+        return (starting_point[0] - length, starting_point[1])
+    if angle == 270:
+        return (starting_point[0], starting_point[1] - length)
+    cos, sin = cos_sin(angle)
+    return (starting_point[0] + length * cos, starting_point[1] + length * sin)
+
 
+def rotation_table(angles) -> np.ndarray:
+    """Compute unit direction vectors for angles and their 90/-90/180 rotations.
 
-def vector_difference(vector1: tuple[float], vector2: tuple[float]) -> tuple[float]:
+    Only one cos/sin pair is evaluated per angle; the rotated directions are
+    derived by swapping and negating components, without extra trig calls.
+
+    Args:
+        angles: angles in degrees
+
+    Returns:
+        np.ndarray: array of shape (len(angles), 4, 2); entry [i, k] is the
+            unit vector at angles[i] rotated by (0, 90, -90, 180)[k] degrees
+    """
+    radians = np.deg2rad(np.asarray(angles, dtype=np.float64))
+    cos, sin = np.cos(radians), np.sin(radians)
+    return np.stack(
+        [
+            np.stack([cos, sin], axis=1),
+            np.stack([-sin, cos], axis=1),
+            np.stack([sin, -cos], axis=1),
+            np.stack([-cos, -sin], axis=1),
+        ],
+        axis=1,
+    )
+
+
+def vector_difference(vector1, vector2) -> np.ndarray:
     """Compute the difference between two vectors.
 
     Args:
-        vector1 (tuple[float]): first vector
-        vector2 (tuple[float]): second vector
+        vector1: first vector
+        vector2: second vector
 
     Returns:
-        tuple[float]: difference between the two vectors
+        np.ndarray: difference between the two vectors
     """
-    return (vector1[0] - vector2[0], vector1[1] - vector2[1])
+    return np.asarray(vector1, dtype=np.float64) - np.asarray(vector2, dtype=np.float64)
 
 
-def vector_sum(vector1: tuple[float], vector2: tuple[float]) -> tuple[float]:
+def vector_sum(vector1, vector2) -> np.ndarray:
     """Compute the sum of two vectors.
 
     Args:
-        vector1 (tuple[float]): first vector
-        vector2 (tuple[float]): second vector
+        vector1: first vector
+        vector2: second vector
 
     Returns:
-        tuple[float]: sum of the two vectors
+        np.ndarray: sum of the two vectors
     """
-    return (vector1[0] + vector2[0], vector1[1] + vector2[1])
+    return np.asarray(vector1, dtype=np.float64) + np.asarray(vector2, dtype=np.float64)
 
 
-def vector_multiply(vector: tuple[float], scalar: float) -> tuple[float]:
+def vector_multiply(vector, scalar: float) -> np.ndarray:
     """Multiply a vector by a scalar.
 
     Args:
-        vector (tuple[float]): vector to multiply
+        vector: vector to multiply
         scalar (float): scalar to multiply the vector by
 
     Returns:
-        tuple[float]: multiplied vector
+        np.ndarray: multiplied vector
     """
-    return (vector[0] * scalar, vector[1] * scalar)
+    return np.asarray(vector, dtype=np.float64) * scalar
 
 
-def normalize_vector(vector: tuple[float]) -> tuple[float]:
+def normalize_vector(vector) -> np.ndarray:
     """Normalize a vector.
 
     Args:
-        vector (tuple[float]): vector to normalize
+        vector: vector to normalize
 
     Returns:
-        tuple[float]: normalized vector
+        np.ndarray: normalized vector
     """
-    norm = math.sqrt(vector[0] ** 2 + vector[1] ** 2)
-    return (vector[0] / norm, vector[1] / norm)
+    vector = np.asarray(vector, dtype=np.float64)
+    return vector / np.linalg.norm(vector)
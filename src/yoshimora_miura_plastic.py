@@ -1,13 +1,23 @@
+import functools
 from typing import Any
 from dxfwrite import DXFEngine as dxf
-import math
-from utils import (
-    end_point_of_line,
-    normalize_vector,
-    vector_difference,
-    vector_sum,
-    vector_multiply,
-)
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from utils import add_entities, cos_sin, end_point_of_line
+from _kernels import beam_chain_points
+
+
+@functools.lru_cache(maxsize=None)
+def _block_angles(angle: float) -> tuple[float]:
+    """Compute the branch angles of a building block, memoized per angle.
+
+    Args:
+        angle (float): angle of the diagonal branches in degrees
+
+    Returns:
+        tuple[float]: the six branch angles in drawing order
+    """
+    return (0, angle, 180 - angle, 180, 180 + angle, -angle)
 
 
 class Branch:
@@ -21,7 +31,7 @@ class Branch:
         beam_gap=2.33,
         beam_length=6.33,
         beam_width=4.83,
-        drawing=dxf.drawing("yoshimura_branch.dxf"),
+        drawing=None,
     ) -> None:
         self.position = position
         self.end_point = end_point_of_line(self.position, length, angle)
@@ -32,6 +42,14 @@ class Branch:
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        self._half_beam_width = (self.beam_width - self.panel_gap) / 2
+        self._extremity_length = (
+            self.length
+            - self.beam_length * self.beam_count
+            - self.beam_gap * (self.beam_count - 1)
+        ) / 2
+        if drawing is None:
+            drawing = dxf.drawing("yoshimura_branch.dxf")
         self.drawing = drawing
 
     def __repr__(self) -> str:
@@ -46,121 +64,67 @@ class Branch:
         Returns:
             float: length of the extremity line
         """
-        return (
-            self.length
-            - self.beam_length * self.beam_count
-            - self.beam_gap * (self.beam_count - 1)
-        ) / 2
+        return self._extremity_length
 
-    def _draw_extremity_line(self, angle: float, extremity_length: float) -> None:
-        """Draw the extremity line of the branch with the given parameters
-
-        Args:
-            angle (float): angle of the extremity line (self.angle + 90 or self.angle - 90) depending on the side
-            extremity_length (float): length of the extremity line
-        """
-        # draw the first extremity line
-        start_point = end_point_of_line(
-            self.position, self.panel_gap / 2, angle
-        )  # going on the good side of the branch
-        end_point = end_point_of_line(start_point, extremity_length, self.angle)
-        self.drawing.add(dxf.line(start_point, end_point))
-
-        # draw the second extremity line
-        start_point = end_point_of_line(
-            self.end_point, self.panel_gap / 2, angle
-        )  # going on the good side of the branch
-        end_point = end_point_of_line(start_point, extremity_length, self.angle - 180)
-        self.drawing.add(dxf.line(start_point, end_point))
-
-    def _get_beam_starting_point(
-        self, angle: float, extremity_length: float
-    ) -> tuple[float]:
-        """Compute the starting point of the beam unit of the branch with the given parameters
-
-        Args:
-            angle (float): angle of the beam (self.angle + 90 or self.angle - 90) depending on the side
-            extremity_length (float): length of the extremity line
-
-        Returns:
-            tuple[float]: starting point of the beam unit
-        """
-        start_point = end_point_of_line(self.position, self.panel_gap / 2, angle)
-        return end_point_of_line(start_point, extremity_length, self.angle)
-
-    def _get_beam_points(
+    def _get_beam_chain_points(
         self, start_point: tuple[float], angle: float
-    ) -> tuple[tuple[float]]:
-        """Get the points of the beam unit of the branch with the given parameters
+    ) -> np.ndarray:
+        """Compute the vertices of every beam of one branch side in one batch
 
         Args:
-            start_point (tuple[float]): starting point of the beam
+            start_point (tuple[float]): starting point of the first beam
             angle (float): angle of the beam (self.angle + 90 or self.angle - 90) depending on the side
 
         Returns:
-            tuple[tuple[float]]: differents points of the beam unit
+            np.ndarray: vertices of the whole beam chain, one row per point
         """
-        beam_point1 = end_point_of_line(
-            start_point,
-            (self.beam_width - self.panel_gap) / 2,
+        return beam_chain_points(
+            start_point[0],
+            start_point[1],
+            self.angle,
             angle,
+            self.beam_count,
+            self.beam_length,
+            self.beam_gap,
+            self._half_beam_width,
         )
-        beam_point2 = end_point_of_line(beam_point1, self.beam_length, self.angle)
-        beam_point3 = end_point_of_line(
-            beam_point2,
-            (self.beam_width - self.panel_gap) / 2,
-            angle + 180,
-        )
-        return beam_point1, beam_point2, beam_point3
-
-    def _draw_beam(
-        self, start_point_beam: tuple[float], angle: float, i: int
-    ) -> tuple[float]:
-        """Draw a beam unit of the branch with the given parameters
 
-        Args:
-            start_point_beam (tuple[float]): starting point of the beam
-            angle (float): angle of the beam (self.angle + 90 or self.angle - 90) depending on the side
-            i (int): beam count index
+    def _collect_entities(self) -> list[tuple[str, list[tuple[float]]]]:
+        """Compute the entities of the branch without drawing them
 
         Returns:
-            tuple[float]: end point of the beam unit if not the last one
+            list[tuple[str, list[tuple[float]]]]: ("line" | "polyline", points) pairs
         """
-        beam_point1, beam_point2, beam_point3 = self._get_beam_points(
-            start_point_beam, angle
-        )
-        if i < self.beam_count - 1:
-            beam_point4 = end_point_of_line(beam_point3, self.beam_gap, self.angle)
-            self.drawing.add(
-                dxf.polyline(
-                    [
-                        start_point_beam,
-                        beam_point1,
-                        beam_point2,
-                        beam_point3,
-                        beam_point4,
-                    ]
-                )
+        entities = []
+        cos_a, sin_a = cos_sin(self.angle)
+        extremity_length = self._extremity_length
+        half_gap = self.panel_gap / 2
+        for sign in (1.0, -1.0):
+            # direction of angle + sign * 90 without extra trig
+            side_x, side_y = -sign * sin_a, sign * cos_a
+            start_point = (
+                self.position[0] + half_gap * side_x,
+                self.position[1] + half_gap * side_y,
             )
-            return beam_point4
-        else:
-            self.drawing.add(
-                dxf.polyline([start_point_beam, beam_point1, beam_point2, beam_point3])
+            start_point_beam = (
+                start_point[0] + extremity_length * cos_a,
+                start_point[1] + extremity_length * sin_a,
+            )
+            beam_points = self._get_beam_chain_points(
+                start_point_beam, self.angle + sign * 90
+            )
+            far_point = (
+                self.end_point[0] + half_gap * side_x,
+                self.end_point[1] + half_gap * side_y,
+            )
+            entities.append(
+                ("polyline", np.vstack([[start_point], beam_points, [far_point]]))
             )
+        return entities
 
     def _draw_branch(self):
         """Draw the branch with the given parameters"""
-        length_extremity_lines = self._get_extremity_length()
-        for angle in (self.angle + 90, self.angle - 90):
-            self._draw_extremity_line(angle, length_extremity_lines)
-            start_point_beam = self._get_beam_starting_point(
-                angle, length_extremity_lines
-            )
-            for i in range(self.beam_count):
-                end_point_beam = self._draw_beam(start_point_beam, angle, i)
-                start_point_beam = end_point_beam
-
-        self.drawing.save()
+        add_entities(self.drawing, self._collect_entities())
 
     def __call__(self):
         return self._draw_branch()
@@ -184,45 +148,53 @@ class BranchTape(Branch):
         )
         return end_point_of_line(start_point, extremity_length, self.angle)
 
-    def _get_beam_points(self, start_point_beam: tuple[float]) -> tuple[tuple[float]]:
-        """Compute the points of the beam unit of the branch with the given parameters
+    def _get_beam_points_batch(self, start_point_beam: tuple[float]) -> np.ndarray:
+        """Compute the vertices of every beam of the tape branch in one batch
+
+        The i-th beam is the first beam translated by i * (beam_length +
+        beam_gap) along the branch, so every vertex is one broadcasted
+        affine expression of the beam index.
 
         Args:
-            start_point_beam (tuple[float]): starting point of the beam
+            start_point_beam (tuple[float]): starting point of the first beam
 
         Returns:
-            tuple[tuple[float]]: differents points of the beam unit
+            np.ndarray: array of shape (beam_count, 5, 2) with the vertices
+                of each beam outline
         """
-        beam_point1 = end_point_of_line(
-            start_point_beam, self.beam_width, self.angle + 90
+        direction = np.array(cos_sin(self.angle))
+        width_side = self.beam_width * np.array(
+            [-direction[1], direction[0]]
+        )  # beam_width along angle + 90
+        base = np.asarray(start_point_beam, dtype=np.float64)
+        first_beam = np.stack(
+            [
+                base,
+                base + width_side,
+                base + width_side + self.beam_length * direction,
+                base + self.beam_length * direction,
+                base,
+            ]
         )
-        beam_point2 = end_point_of_line(beam_point1, self.beam_length, self.angle)
-        beam_point3 = end_point_of_line(beam_point2, self.beam_width, self.angle - 90)
-        beam_point4 = end_point_of_line(beam_point3, self.beam_length, self.angle + 180)
-        return beam_point1, beam_point2, beam_point3, beam_point4
+        offsets = (
+            np.arange(self.beam_count)[:, None]
+            * (self.beam_length + self.beam_gap)
+            * direction
+        )
+        return first_beam[None, :, :] + offsets[:, None, :]
 
-    def _draw_branch(self):
+    def _collect_entities(self) -> list[tuple[str, list[tuple[float]]]]:
+        """Compute the entities of the tape branch without drawing them
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line" | "polyline", points) pairs
+        """
         length_extremity_lines = self._get_extremity_length()
         start_point_beam = self._get_beam_starting_point(length_extremity_lines)
-        for _ in range(self.beam_count):
-            beam_point1, beam_point2, beam_point3, beam_point4 = self._get_beam_points(
-                start_point_beam
-            )
-            self.drawing.add(
-                dxf.polyline(
-                    [
-                        start_point_beam,
-                        beam_point1,
-                        beam_point2,
-                        beam_point3,
-                        beam_point4,
-                    ]
-                )
-            )
-            start_point_beam = end_point_of_line(
-                start_point_beam, self.beam_length + self.beam_gap, self.angle
-            )
-        self.drawing.save()
+        return [
+            ("polyline", beam_points)
+            for beam_points in self._get_beam_points_batch(start_point_beam)
+        ]
 
 
 class BuildingBlockYoshimora:
@@ -233,45 +205,65 @@ class BuildingBlockYoshimora:
         length: float,
         angle: float,
         beam_count: int,
-        activated_branch=[True for _ in range(6)],
+        activated_branch=None,
         panel_gap=1.2,
         beam_gap=2.33,
         beam_length=6.33,
         beam_width=4.83,
-        drawing=dxf.drawing("yoshimura_pattern.dxf"),
+        drawing=None,
         tape=False,
+        support_deactivated=True,
     ) -> None:
         self.center = center
         self.radius = radius
         self.length = length
         self.angle = angle
         self.beam_count = beam_count
-        self.activated_branch = activated_branch
+        if activated_branch is None:
+            activated_branch = (True,) * 6
+        self.activated_branch = tuple(activated_branch)
         self.panel_gap = panel_gap
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimura_pattern.dxf")
         self.drawing = drawing
         self.tape = tape
-        self.angles = [
-            0,
-            self.angle,
-            180 - self.angle,
-            180,
-            180 + self.angle,
-            -self.angle,
-        ]
+        # supports are also drawn under deactivated branches by default so
+        # that every block keeps its full set of junctions in a tesselation
+        self.support_deactivated = support_deactivated
+        self.angles = _block_angles(self.angle)
+        self._horizontal_length = (
+            2 * cos_sin(self.angle)[0] * (self.length + 2 * self.radius)
+        ) - 2 * self.radius
+        # branches 0 and 3 are the horizontal ones of the tesselation grid
+        self._branch_lengths = tuple(
+            self._horizontal_length if i in (0, 3) else self.length for i in range(6)
+        )
+        self._branch_positions = None
+        # every extremity point sits at hypot(radius, panel_gap / 2) from the
+        # center, so the support midpoint scale is one constant per block
+        self._support_scale = (self.radius / 2) / (
+            self.radius**2 + (self.panel_gap / 2) ** 2
+        ) ** 0.5
 
     def _compute_branch_position(self) -> list[tuple[float]]:
         """Compute the position of the branches
 
+        The positions only depend on the center and radius, so they are
+        computed once from the memoized trig pairs and cached.
+
         Returns:
             list[tuple[float]]: list of the position of the branches in the order of the angles
         """
-        branch_positions = []
-        for angle in self.angles:
-            branch_positions.append(end_point_of_line(self.center, self.radius, angle))
-        return branch_positions
+        if self._branch_positions is None:
+            cx, cy = self.center
+            self._branch_positions = [
+                (cx + self.radius * cos, cy + self.radius * sin)
+                for cos, sin in map(cos_sin, self.angles)
+            ]
+        return self._branch_positions
 
     def _get_horizontal_branch_length(self) -> float:
         """Compute the length of the horizontal branch of the building block
@@ -279,9 +271,7 @@ class BuildingBlockYoshimora:
         Returns:
             float: length of the horizontal branch
         """
-        return (
-            2 * math.cos(math.radians(self.angle)) * (self.length + 2 * self.radius)
-        ) - 2 * self.radius
+        return self._horizontal_length
 
     def _create_branch(
         self, position: tuple[float], length: float, angle: float
@@ -321,58 +311,76 @@ class BuildingBlockYoshimora:
                 drawing=self.drawing,
             )
 
-    def _draw_branch_center_support(self, position: tuple[float], angle: float) -> None:
-        """Draw the center support of the branch useful for the manufacturing
+    def _collect_center_support_entities(
+        self, position: tuple[float], angle: float
+    ) -> list[tuple[str, list[tuple[float]]]]:
+        """Compute the center support lines of the branch without drawing them
 
         Args:
             position (tuple[float]): position of the branch
             angle (float): angle of the branch
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line", points) pairs
         """
-        start_point_extremity1 = end_point_of_line(
-            position, self.panel_gap / 2, angle - 90
-        )
-        dir_vector1 = normalize_vector(
-            vector_difference(self.center, start_point_extremity1)
+        center = np.asarray(self.center, dtype=np.float64)
+        cos_a, sin_a = cos_sin(angle)
+        half_gap = self.panel_gap / 2
+
+        # extremity points offset perpendicular to the branch (angle -+ 90)
+        start_point_extremity1 = np.array(
+            [position[0] + half_gap * sin_a, position[1] - half_gap * cos_a]
         )
-        second_point_extremity1 = vector_sum(
-            start_point_extremity1,
-            vector_multiply(dir_vector1, self.radius / 2),
+        second_point_extremity1 = start_point_extremity1 + self._support_scale * (
+            center - start_point_extremity1
         )
-        self.drawing.add(dxf.line(start_point_extremity1, second_point_extremity1))
 
-        start_point_extremity2 = end_point_of_line(
-            position, self.panel_gap / 2, angle + 90
+        start_point_extremity2 = np.array(
+            [position[0] - half_gap * sin_a, position[1] + half_gap * cos_a]
         )
-        dir_vector2 = normalize_vector(
-            vector_difference(self.center, start_point_extremity2)
+        second_point_extremity2 = start_point_extremity2 + self._support_scale * (
+            center - start_point_extremity2
         )
-        second_point_extremity2 = vector_sum(
-            start_point_extremity2,
-            vector_multiply(dir_vector2, self.radius / 2),
-        )
-        self.drawing.add(dxf.line(start_point_extremity2, second_point_extremity2))
-        self.drawing.add(dxf.line(second_point_extremity1, second_point_extremity2))
-        self.drawing.save()
+        # the three support segments form one connected path
+        return [
+            (
+                "polyline",
+                np.stack(
+                    [
+                        start_point_extremity1,
+                        second_point_extremity1,
+                        second_point_extremity2,
+                        start_point_extremity2,
+                    ]
+                ),
+            )
+        ]
 
-    def _draw_building_block(self) -> None:
-        """Draw the building block with the given parameters"""
+    def _collect_entities(self) -> list[tuple[str, list[tuple[float]]]]:
+        """Compute the entities of the building block without drawing them
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line" | "polyline", points) pairs
+        """
+        entities = []
         branch_positions = self._compute_branch_position()
         for i, branch_state in enumerate(self.activated_branch):
             if branch_state:  # branch is activated
-                # adapt the length of the branch for the tesselation
-                if i == 0 or i == 3:
-                    length = self._get_horizontal_branch_length()
-                else:
-                    length = self.length
                 branch = self._create_branch(
-                    branch_positions[i], length, self.angles[i]
+                    branch_positions[i], self._branch_lengths[i], self.angles[i]
                 )  # create the i-th branch
-                branch()  # draw the branch
+                entities += branch._collect_entities()
 
-            if not self.tape:
-                self._draw_branch_center_support(
+            if not self.tape and (branch_state or self.support_deactivated):
+                entities += self._collect_center_support_entities(
                     branch_positions[i], self.angles[i]
-                )  # draw the center support
+                )  # center support of the branch
+        return entities
+
+    def _draw_building_block(self) -> None:
+        """Draw the building block with the given parameters"""
+        add_entities(self.drawing, self._collect_entities())
+        self.drawing.save()
 
     def __call__(self) -> None:
         self._draw_building_block()
@@ -391,8 +399,9 @@ class YoshimoraTesselation:
         beam_gap=2.33,
         beam_length=6.33,
         beam_width=4.83,
-        drawing=dxf.drawing("yoshimura_pattern.dxf"),
+        drawing=None,
         tape=False,
+        workers=None,
         *args,
         **kwargs,
     ) -> None:
@@ -411,10 +420,11 @@ class YoshimoraTesselation:
             beam_width (float, optional): beam width (Defaults to 4.83, see README for more schematic)
             drawing (_type_, optional): dxf object (Defaults to dxf.drawing("yoshimura_pattern.dxf"))
             tape (bool, optional): tape tesselation or not (Defaults to False)
+            workers (int, optional): number of processes used to compute the
+                block geometry in parallel (Defaults to None, serial)
         """
-        assert (type(size) == tuple) and (
-            len(size) == 2
-        ), "Size must be a tuple of 2 integers"
+        if not isinstance(size, tuple) or len(size) != 2:
+            raise TypeError("Size must be a tuple of 2 integers")
         self.size = size
         self.center = center
         self.radius = radius
@@ -425,8 +435,62 @@ class YoshimoraTesselation:
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimura_pattern.dxf")
         self.drawing = drawing
         self.tape = tape
+        self.workers = workers
+        step = 2 * self.radius + self.length
+        cos_a, sin_a = cos_sin(self.angle)
+        self._row_offset = step * cos_a  # x shift of the even rows
+        self._column_step = 2 * cos_a * step  # x distance between columns
+        self._row_step = step * sin_a  # y distance between rows
+        self._centers = self._build_center_grid()
+        self._activation_table = self._build_activation_table()
+        # branch i of cell (r, c) is active iff mask[r, c] >> i & 1
+        self._activation_masks = (
+            self._activation_table * (1 << np.arange(6))
+        ).sum(axis=2)
+        self._templates = {}
+        self._origin_block = None
+
+    def _build_center_grid(self) -> np.ndarray:
+        """Compute the centers of every building block of the grid at once.
+
+        The centers are affine in the block indices, so the whole grid is a
+        single broadcasted expression over the row/column ranges.
+
+        Returns:
+            np.ndarray: array of shape (size[0], size[1], 2) with the centers
+        """
+        rows = np.arange(self.size[0])[:, None]
+        columns = np.arange(self.size[1])[None, :]
+        x = (
+            self.center[0]
+            + columns * self._column_step
+            + np.where(rows % 2 == 0, self._row_offset, 0.0)
+        )
+        y = self.center[1] - rows * self._row_step
+        return np.stack(np.broadcast_arrays(x, y), axis=-1)
+
+    def _build_activation_table(self) -> np.ndarray:
+        """Choose which branches to activate for every block of the grid.
+
+        The deactivation rules avoid overlapping branches between adjacent
+        blocks and only depend on the block indices, so they are evaluated
+        once for the whole grid with boolean masks.
+
+        Returns:
+            np.ndarray: boolean array of shape (size[0], size[1], 6)
+        """
+        rows, columns = np.indices(self.size)
+        table = np.ones((self.size[0], self.size[1], 6), dtype=bool)
+        table[..., 3][columns > 0] = False
+        table[..., 2][(columns > 0) & (rows > 0)] = False
+        table[..., 2][(rows % 2 == 0) & (columns == 0) & (rows > 0)] = False
+        table[..., 1][(columns < self.size[1] - 1) & (rows > 0)] = False
+        table[..., 1][(columns == self.size[1] - 1) & (rows % 2 == 1)] = False
+        return table
 
     def _get_activated_branch(self, position: tuple[int]) -> list[bool]:
         """Choose which branch to activate based on the position of the building block to avoid overlapping
@@ -437,29 +501,7 @@ class YoshimoraTesselation:
         Returns:
             list[bool]: list of the activated branches
         """
-        activated_branch = [True] * 6
-
-        # Deactivate branches based on position
-        if position[1] > 0:  # If pos[1] is greater than 0
-            activated_branch[3] = False  # Deactivate branch 3
-            if position[0] > 0:  # If pos[0] is greater than 0
-                activated_branch[2] = False  # Deactivate branch 2
-
-        if (
-            position[0] % 2 == 0 and position[1] == 0 and position[0] > 0
-        ):  # Special condition for even pos[0] and pos[1] equals 0
-            activated_branch[2] = False  # Deactivate branch 2
-
-        if (
-            position[1] < self.size[1] - 1 and position[0] > 0
-        ):  # If pos[1] is within bounds and pos[0] is greater than 0
-            activated_branch[1] = False  # Deactivate branch 1
-
-        if (
-            position[1] == self.size[1] - 1 and position[0] % 2 == 1
-        ):  # Special condition for pos[1] at upper bound and odd pos[0]
-            activated_branch[1] = False  # Deactivate branch 1
-        return activated_branch
+        return self._activation_table[position[0], position[1]].tolist()
 
     def _get_block_center(self, position: tuple[int]) -> tuple[float]:
         """Compute the center of the building block based on its position
@@ -470,39 +512,33 @@ class YoshimoraTesselation:
         Returns:
             tuple[float]: center of the building block
         """
-        if position[0] % 2 == 0:
-            offset = end_point_of_line(
-                (0, 0), 2 * self.radius + self.length, self.angle
-            )[0]
-        else:
-            offset = 0
+        return tuple(self._centers[position[0], position[1]])
 
-        vertical_mov = end_point_of_line(
-            self.center, position[0] * (2 * self.radius + self.length), -self.angle
-        )
-        horizontal_mov = end_point_of_line(
-            self.center,
-            position[1]
-            * 2
-            * math.cos(math.radians(self.angle))
-            * (self.length + 2 * self.radius),
-            0,
-        )
-        return horizontal_mov[0] + offset, vertical_mov[1]
+    def _block_entities(
+        self, position: tuple[int]
+    ) -> list[tuple[str, list[tuple[float]]]]:
+        """Get the entities of a block from a translated geometry template.
 
-    def _draw_tesselation(self) -> None:
-        """Draw the tesselation given the parameters"""
-        for i in range(self.size[0]):
-            for j in range(self.size[1]):
-                center = self._get_block_center((i, j))
-                activated_branch = self._get_activated_branch((i, j))
-                yoshimora_block = BuildingBlockYoshimora(
-                    center=center,
+        All blocks sharing an activation pattern have the same geometry up
+        to translation, so the vertices are generated once at the origin
+        per pattern and shifted to each block center afterwards.
+
+        Args:
+            position (tuple[int]): coordinates (index) of the building block
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line" | "polyline", points) pairs
+        """
+        key = int(self._activation_masks[position[0], position[1]])
+        template = self._templates.get(key)
+        if template is None:
+            if self._origin_block is None:
+                self._origin_block = BuildingBlockYoshimora(
+                    center=(0, 0),
                     radius=self.radius,
                     length=self.length,
                     angle=self.angle,
                     beam_count=self.beam_count,
-                    activated_branch=activated_branch,
                     panel_gap=self.panel_gap,
                     beam_gap=self.beam_gap,
                     beam_length=self.beam_length,
@@ -510,7 +546,58 @@ class YoshimoraTesselation:
                     drawing=self.drawing,
                     tape=self.tape,
                 )
-                yoshimora_block()
+            # reuse the same origin block, only the activation changes
+            self._origin_block.activated_branch = tuple(
+                key >> i & 1 == 1 for i in range(6)
+            )
+            template = [
+                (kind, np.asarray(points, dtype=np.float64))
+                for kind, points in self._origin_block._collect_entities()
+            ]
+            self._templates[key] = template
+        offset = self._centers[position[0], position[1]]
+        return [(kind, points + offset) for kind, points in template]
+
+    def _build_block(self, position: tuple[int]) -> BuildingBlockYoshimora:
+        """Build the block of a grid cell without drawing anything
+
+        Args:
+            position (tuple[int]): coordinates (index) of the building block
+
+        Returns:
+            BuildingBlockYoshimora: block of the cell
+        """
+        return BuildingBlockYoshimora(
+            center=self._get_block_center(position),
+            radius=self.radius,
+            length=self.length,
+            angle=self.angle,
+            beam_count=self.beam_count,
+            activated_branch=self._get_activated_branch(position),
+            panel_gap=self.panel_gap,
+            beam_gap=self.beam_gap,
+            beam_length=self.beam_length,
+            beam_width=self.beam_width,
+            drawing=self.drawing,
+            tape=self.tape,
+        )
+
+    def _draw_tesselation(self) -> None:
+        """Draw the tesselation given the parameters"""
+        positions = [
+            (i, j) for i in range(self.size[0]) for j in range(self.size[1])
+        ]
+        if self.workers is not None and self.workers > 1:
+            blocks = [self._build_block(position) for position in positions]
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                entity_lists = list(
+                    pool.map(BuildingBlockYoshimora._collect_entities, blocks)
+                )
+        else:
+            entity_lists = [self._block_entities(position) for position in positions]
+        for entities in entity_lists:
+            add_entities(self.drawing, entities)
+        self.drawing.save()
 
     def __call__(self):
         self._draw_tesselation()
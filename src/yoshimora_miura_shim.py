@@ -1,8 +1,13 @@
 from typing import Any
 from dxfwrite import DXFEngine as dxf
+import numpy as np
 from utils import (
+    add_entities,
     end_point_of_line,
+    rotation_table,
 )
+from _kernels import shim_branch_points, shim_separator_points
+from concurrent.futures import ProcessPoolExecutor
 import math
 
 
@@ -19,7 +24,7 @@ class ShimBranch:
         beam_gap=2.33,
         beam_length=6.33,
         beam_width=4.83,
-        drawing=dxf.drawing("yoshimora_branch_shim.dxf"),
+        drawing=None,
         *args,
         **kwargs,
     ) -> None:
@@ -33,7 +38,9 @@ class ShimBranch:
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
-        self.width = self.beam_width * 1 / self.ratio
+        self.width = self.beam_width / self.ratio
+        if drawing is None:
+            drawing = dxf.drawing("yoshimora_branch_shim.dxf")
         self.drawing = drawing
 
     def __repr__(self) -> str:
@@ -74,33 +81,16 @@ class ShimBranch:
         """
         length_extremity_lines = self._get_extremity_length()
         start_point = self._get_branch_starting_point()
-        shim_point1 = end_point_of_line(start_point, length_extremity_lines, self.angle)
-        shim_point2 = end_point_of_line(
-            shim_point1,
-            (self.beam_width - self.panel_gap) / 2,
-            self.angle - 90,
-        )
-        shim_point3 = end_point_of_line(shim_point2, self.margin, self.angle)
-        shim_point4 = end_point_of_line(shim_point3, self.width, self.angle + 90)
-        shim_point5 = end_point_of_line(shim_point4, self.margin, self.angle + 180)
-        shim_point6 = end_point_of_line(
-            shim_point5,
+        points = shim_branch_points(
+            start_point[0],
+            start_point[1],
+            self.angle,
+            length_extremity_lines,
             (self.beam_width - self.panel_gap) / 2,
-            self.angle - 90,
-        )
-        end_shim = end_point_of_line(
-            shim_point6, length_extremity_lines, self.angle - 180
-        )
-        return (
-            start_point,
-            shim_point1,
-            shim_point2,
-            shim_point3,
-            shim_point4,
-            shim_point5,
-            shim_point6,
-            end_shim,
+            self.margin,
+            self.width,
         )
+        return tuple(tuple(point) for point in points)
 
     def _draw_branch(self) -> tuple[float]:
         (
@@ -128,7 +118,6 @@ class ShimBranch:
                 ]
             )
         )
-        self.drawing.save()
         return end_shim
 
     def __call__(self) -> tuple[float]:
@@ -147,10 +136,10 @@ class ShimCenterPart:
         beam_count: int,
         panel_gap: 1.2,
         beam_gap: 2.2,
-        activated_branch=[True for _ in range(6)],
+        activated_branch=None,
         beam_length=6.33,
         beam_width=4.33,
-        drawing=dxf.drawing("yoshimora_shim.dxf"),
+        drawing=None,
         *args,
         **kwargs,
     ) -> None:
@@ -163,19 +152,30 @@ class ShimCenterPart:
         self.beam_count = beam_count
         self.panel_gap = panel_gap
         self.beam_gap = beam_gap
-        self.activated_branch = activated_branch
+        self.activated_branch = (
+            (True,) * 6 if activated_branch is None else tuple(activated_branch)
+        )
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimora_shim.dxf")
         self.drawing = drawing
-        self.angles = [
+        self.angles = (
             0,
             self.angle,
             180 - self.angle,
             180,
             180 + self.angle,
             -self.angle,
-        ]
-        self.width = self.beam_width * 1 / self.ratio
+        )
+        self._rot_table = rotation_table(self.angles)
+        self.width = self.beam_width / self.ratio
+        self._start_shift = (self.width - self.beam_width + self.panel_gap) / 2
+        self._half_beam_width = (self.beam_width - self.panel_gap) / 2
+        self._beams_length = self.beam_length * self.beam_count + self.beam_gap * (
+            self.beam_count - 1
+        )
+        self._branch_positions = None
 
     def _get_branch_position(self) -> list[tuple[float]]:
         """Compute the position of the branches of the shim
@@ -183,31 +183,18 @@ class ShimCenterPart:
         Returns:
             list[tuple[float]]: _description_
         """
-        branch_positions = []
-        for i, angle in enumerate(self.angles):
-            point = end_point_of_line(self.center, self.radius, angle)
-            for j in range(i):
-                if j == 0:
-                    point = end_point_of_line(
-                        point,
-                        (self.beam_width * 1 / self.ratio - self.beam_width) / 2,
-                        self.angles[j] + 90,
-                    )
-                else:
-                    point = end_point_of_line(
-                        point,
-                        self.beam_width * 1 / self.ratio - self.beam_width,
-                        self.angles[j] + 90,
-                    )
-            if i != 0:
-                point = end_point_of_line(
-                    point,
-                    self.panel_gap / 2
-                    - (self.width - self.beam_width + self.panel_gap) / 2,
-                    self.angles[i] - 90,
-                )
-            branch_positions.append(point)
-        return branch_positions
+        if self._branch_positions is not None:
+            return self._branch_positions
+        table = self._rot_table
+        center = np.asarray(self.center, dtype=np.float64)
+        shift = self.panel_gap / 2 - (self.width - self.beam_width + self.panel_gap) / 2
+        steps = np.full(len(self.angles), self.width - self.beam_width)
+        steps[0] /= 2
+        cumulative = np.cumsum(steps[:, None] * table[:, 1], axis=0)
+        points = center + self.radius * table[:, 0]
+        points[1:] += cumulative[:-1] + shift * table[1:, 2]
+        self._branch_positions = [tuple(point) for point in points]
+        return self._branch_positions
 
     def _get_branch_length(self, idx: int) -> float:
         """Compute the length of the branch at the given index
@@ -225,39 +212,56 @@ class ShimCenterPart:
         else:
             return self.length
 
-    def _draw_shim(self):
+    def _collect_entities(self) -> list[tuple[str, list[tuple[float]]]]:
+        """Compute the entities of the shim center part without drawing them.
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line" | "polyline", points) pairs
+        """
+        if not any(self.activated_branch):
+            return []
+        entities = []
         branch_position = self._get_branch_position()
+        table = self._rot_table
+        start_shift = self._start_shift
+        half_beam_width = self._half_beam_width
+        beams_length = self._beams_length
         for i, branch_state in enumerate(self.activated_branch):
             if branch_state:
                 length = self._get_branch_length(i)
-                branch = ShimBranch(
-                    branch_position[i],
-                    length,
+                start_point = (
+                    np.asarray(branch_position[i], dtype=np.float64)
+                    + start_shift * table[i, 2]
+                )
+                points = shim_branch_points(
+                    start_point[0],
+                    start_point[1],
                     self.angles[i],
-                    self.ratio,
+                    (length - beams_length - self.margin) / 2,
+                    half_beam_width,
                     self.margin,
-                    self.beam_count,
-                    self.panel_gap,
-                    self.beam_gap,
-                    self.beam_length,
-                    self.beam_width,
-                    self.drawing,
+                    self.width,
                 )
-                start_point = branch._get_branch_starting_point()
                 if i != 0:
-                    self.drawing.add(dxf.line(start_point, end_shim))
-                end_shim = branch()  # draw the branch and get the end point
-        self.drawing.add(
-            dxf.line(
-                end_shim,
-                end_point_of_line(
-                    branch_position[0],
-                    (self.width - self.beam_width + self.panel_gap) / 2,
-                    self.angles[0] - 90,
+                    entities.append(("line", np.stack([points[0], end_shim])))
+                entities.append(("polyline", points))
+                end_shim = points[-1]
+        entities.append(
+            (
+                "line",
+                np.stack(
+                    [
+                        end_shim,
+                        np.asarray(branch_position[0], dtype=np.float64)
+                        + start_shift * table[0, 2],
+                    ]
                 ),
             )
-        )  # draw the last join between the branches
-        self.drawing.save()
+        )  # last join between the branches
+        return entities
+
+    def _draw_shim(self):
+        add_entities(self.drawing, self._collect_entities())
 
     def __call__(self):
         self._draw_shim()
@@ -274,7 +278,7 @@ class ShimSep:
         beam_gap: 2.2,
         beam_length=6.33,
         beam_width=4.33,
-        drawing=dxf.drawing("yoshimora_shim.dxf"),
+        drawing=None,
         *args,
         **kwargs,
     ):
@@ -286,62 +290,35 @@ class ShimSep:
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimora_shim.dxf")
         self.drawing = drawing
-        self.width = self.beam_width * 1 / self.ratio
+        self.width = self.beam_width / self.ratio
 
-    def _get_seperator_points(self) -> list[tuple[float]]:
+    def _get_seperator_points(self) -> np.ndarray:
         """Get the points of the shim seperator
 
         Returns:
-            list[tuple[float]]: points of the shim seperator
+            np.ndarray: array of shape (13, 2) with the seperator points
         """
         start_point = end_point_of_line(
             self.center, (self.beam_gap + self.margin) / 2, self.angle + 180
         )
-        point1 = end_point_of_line(start_point, self.width / 2, self.angle + 90)
-        point2 = end_point_of_line(point1, self.margin, self.angle)
-        point3 = end_point_of_line(
-            point2, (self.beam_width - self.panel_gap) / 2, self.angle - 90
-        )
-        point4 = end_point_of_line(point3, self.beam_gap - self.margin, self.angle)
-        point5 = end_point_of_line(
-            point4, (self.beam_width - self.panel_gap) / 2, self.angle + 90
-        )
-        point6 = end_point_of_line(point5, self.margin, self.angle)
-        point7 = end_point_of_line(point6, self.width, self.angle - 90)
-        point8 = end_point_of_line(point7, self.margin, self.angle + 180)
-        point9 = end_point_of_line(
-            point8, (self.beam_width - self.panel_gap) / 2, self.angle + 90
-        )
-        point10 = end_point_of_line(
-            point9, self.beam_gap - self.margin, self.angle + 180
-        )
-        point11 = end_point_of_line(
-            point10, (self.beam_width - self.panel_gap) / 2, self.angle - 90
+        return shim_separator_points(
+            start_point[0],
+            start_point[1],
+            self.angle,
+            (self.beam_width - self.panel_gap) / 2,
+            self.margin,
+            self.width,
+            self.beam_gap,
         )
-        point12 = end_point_of_line(point11, self.margin, self.angle + 180)
-        return [
-            start_point,
-            point1,
-            point2,
-            point3,
-            point4,
-            point5,
-            point6,
-            point7,
-            point8,
-            point9,
-            point10,
-            point11,
-            point12,
-        ]
 
     def _draw_shim_seperator(self) -> None:
         """Draw the shim seperator"""
         points = self._get_seperator_points()[1:]
-        points.append(points[0])  # close the loop
-        self.drawing.add(dxf.polyline(points))
-        self.drawing.save()
+        points = np.vstack([points, points[:1]])  # close the loop
+        self.drawing.add(dxf.polyline(points.tolist()))
 
     def __call__(self):
         self._draw_shim_seperator()
@@ -359,10 +336,10 @@ class BuildingBlockShimYoshimora:
         beam_count: int,
         panel_gap: 1.2,
         beam_gap: 2.2,
-        activated_branch=[True for _ in range(6)],
+        activated_branch=None,
         beam_length=6.33,
         beam_width=4.33,
-        drawing=dxf.drawing("yoshimora_shim.dxf"),
+        drawing=None,
         *args,
         **kwargs,
     ) -> None:
@@ -375,19 +352,25 @@ class BuildingBlockShimYoshimora:
         self.beam_count = beam_count
         self.panel_gap = panel_gap
         self.beam_gap = beam_gap
-        self.activated_branch = activated_branch
+        self.activated_branch = (
+            (True,) * 6 if activated_branch is None else tuple(activated_branch)
+        )
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("yoshimora_shim.dxf")
         self.drawing = drawing
-        self.angles = [
+        self.angles = (
             0,
             self.angle,
             180 - self.angle,
             180,
             180 + self.angle,
             -self.angle,
-        ]
-        self.width = self.beam_width * 1 / self.ratio
+        )
+        self._rot_table = rotation_table(self.angles)
+        self.width = self.beam_width / self.ratio
+        self._branch_positions = None
 
     def _get_branch_position(self) -> list[tuple[float]]:
         """Compute the position of the branches of the shim
@@ -395,31 +378,18 @@ class BuildingBlockShimYoshimora:
         Returns:
             list[tuple[float]]: _description_
         """
-        branch_positions = []
-        for i, angle in enumerate(self.angles):
-            point = end_point_of_line(self.center, self.radius, angle)
-            for j in range(i):
-                if j == 0:
-                    point = end_point_of_line(
-                        point,
-                        (self.beam_width * 1 / self.ratio - self.beam_width) / 2,
-                        self.angles[j] + 90,
-                    )
-                else:
-                    point = end_point_of_line(
-                        point,
-                        self.beam_width * 1 / self.ratio - self.beam_width,
-                        self.angles[j] + 90,
-                    )
-            if i != 0:
-                point = end_point_of_line(
-                    point,
-                    self.panel_gap / 2
-                    - (self.width - self.beam_width + self.panel_gap) / 2,
-                    self.angles[i] - 90,
-                )
-            branch_positions.append(point)
-        return branch_positions
+        if self._branch_positions is not None:
+            return self._branch_positions
+        table = self._rot_table
+        center = np.asarray(self.center, dtype=np.float64)
+        shift = self.panel_gap / 2 - (self.width - self.beam_width + self.panel_gap) / 2
+        steps = np.full(len(self.angles), self.width - self.beam_width)
+        steps[0] /= 2
+        cumulative = np.cumsum(steps[:, None] * table[:, 1], axis=0)
+        points = center + self.radius * table[:, 0]
+        points[1:] += cumulative[:-1] + shift * table[1:, 2]
+        self._branch_positions = [tuple(point) for point in points]
+        return self._branch_positions
 
     def _get_offset_length(self, length) -> float:
         """Compute the offset length of the shim
@@ -454,26 +424,36 @@ class BuildingBlockShimYoshimora:
         else:
             return self.length
 
-    def _get_seperator_center(
-        self, idx: int, count: int, offset: float, branch_position: tuple[float]
-    ) -> tuple[float]:
-        """Compute the center of the shim seperator
+    def _get_seperator_centers(
+        self, idx: int, offset: float, branch_position: tuple[float]
+    ) -> np.ndarray:
+        """Compute the centers of every shim seperator of one branch
+
+        The seperators are evenly spaced along the branch, so all the
+        centers are computed in one vectorized expression.
 
         Args:
-            count (int): count of the beam
+            idx (int): index of the branch
             offset (float): offset of the shim
             branch_position (tuple[float]): position of the branch
 
         Returns:
-            tuple[float]: center of the shim seperator
+            np.ndarray: array of shape (beam_count - 1, 2) with the centers
         """
-        return end_point_of_line(
-            branch_position,
-            offset + count * (self.beam_gap + self.beam_length),
-            self.angles[idx],
+        distances = offset + np.arange(self.beam_count - 1) * (
+            self.beam_gap + self.beam_length
+        )
+        return (
+            np.asarray(branch_position, dtype=np.float64)
+            + distances[:, None] * self._rot_table[idx, 0]
         )
 
-    def _draw_shim(self) -> None:
+    def _collect_entities(self) -> list[tuple[str, list[tuple[float]]]]:
+        """Compute the entities of the whole block without drawing them.
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line" | "polyline", points) pairs
+        """
         center_shim = ShimCenterPart(
             self.center,
             self.radius,
@@ -484,24 +464,23 @@ class BuildingBlockShimYoshimora:
             self.beam_count,
             self.panel_gap,
             self.beam_gap,
-            [True for _ in range(6)],
+            (True,) * 6,
             self.beam_length,
             self.beam_width,
             self.drawing,
         )
-        center_shim()  # draw the center part of the shim
+        entities = center_shim._collect_entities()
         branch_position = center_shim._get_branch_position()
         for i, branch_state in enumerate(self.activated_branch):
+            if not branch_state:
+                continue
             length = self._get_branch_length(i)
             offset = self._get_offset_length(length)
-            for count in range(self.beam_count - 1):
-                if not branch_state:
-                    continue
-                center_sep = self._get_seperator_center(
-                    i, count, offset, branch_position[i]
-                )
+            for center_sep in self._get_seperator_centers(
+                i, offset, branch_position[i]
+            ):
                 shim_sep = ShimSep(
-                    center_sep,
+                    tuple(center_sep),
                     self.angles[i],
                     self.ratio,
                     self.margin,
@@ -511,7 +490,13 @@ class BuildingBlockShimYoshimora:
                     self.beam_width,
                     self.drawing,
                 )
-                shim_sep()
+                points = shim_sep._get_seperator_points()[1:]
+                points = np.vstack([points, points[:1]])  # close the loop
+                entities.append(("polyline", points))
+        return entities
+
+    def _draw_shim(self) -> None:
+        add_entities(self.drawing, self._collect_entities())
 
     def __call__(self):
         self._draw_shim()
@@ -532,7 +517,8 @@ class ShimTesselation:
         beam_gap=2.33,
         beam_length=6.33,
         beam_width=4.83,
-        drawing=dxf.drawing("shim.dxf"),
+        drawing=None,
+        workers=None,
         *args,
         **kwargs,
     ) -> None:
@@ -548,77 +534,64 @@ class ShimTesselation:
         self.beam_gap = beam_gap
         self.beam_length = beam_length
         self.beam_width = beam_width
+        if drawing is None:
+            drawing = dxf.drawing("shim.dxf")
         self.drawing = drawing
-        self.width = self.beam_width * 1 / self.ratio
-        self.angles = [
+        self.workers = workers
+        self.width = self.beam_width / self.ratio
+        self.angles = (
             0,
             self.angle,
             180 - self.angle,
             180,
             180 + self.angle,
             -self.angle,
-        ]
+        )
+        self._rot_table = rotation_table(self.angles)
+        self._activation_table = self._build_activation_table()
+        self._templates = {}
+
+    def _build_activation_table(self) -> np.ndarray:
+        """Precompute the activated branches of every block of the grid.
+
+        The deactivation rules only depend on the block indices, so they are
+        evaluated once for the whole grid with boolean masks (one extra row is
+        kept for the reference block computed below the last row).
+
+        Returns:
+            np.ndarray: boolean array of shape (size[0] + 1, size[1], 6)
+        """
+        rows, columns = np.indices((self.size[0] + 1, self.size[1]))
+        table = np.ones((self.size[0] + 1, self.size[1], 6), dtype=bool)
+        table[..., 3][columns > 0] = False
+        table[..., 2][(columns > 0) & (rows > 0)] = False
+        table[..., 2][(rows % 2 == 0) & (columns == 0) & (rows > 0)] = False
+        table[..., 1][(columns < self.size[1] - 1) & (rows > 0)] = False
+        table[..., 1][(columns == self.size[1] - 1) & (rows % 2 == 1)] = False
+        return table
 
     def _compute_activated_branch(self, position: tuple[int]) -> list[bool]:
-        activated_branch = [True] * 6
-
-        # Deactivate branches based on position
-        if position[1] > 0:  # If pos[1] is greater than 0
-            activated_branch[3] = False  # Deactivate branch 3
-            if position[0] > 0:  # If pos[0] is greater than 0
-                activated_branch[2] = False  # Deactivate branch 2
-
-        if (
-            position[0] % 2 == 0 and position[1] == 0 and position[0] > 0
-        ):  # Special condition for even pos[0] and pos[1] equals 0
-            activated_branch[2] = False  # Deactivate branch 2
-
-        if (
-            position[1] < self.size[1] - 1 and position[0] > 0
-        ):  # If pos[1] is within bounds and pos[0] is greater than 0
-            activated_branch[1] = False  # Deactivate branch 1
-
-        if (
-            position[1] == self.size[1] - 1 and position[0] % 2 == 1
-        ):  # Special condition for pos[1] at upper bound and odd pos[0]
-            activated_branch[1] = False  # Deactivate branch 1
-        return activated_branch
+        return self._activation_table[position[0], position[1]].tolist()
 
     def _get_center_position(
         self, branch_number: int, branch_position: tuple[float]
     ) -> tuple[float]:
-        point = end_point_of_line(
-            branch_position,
-            (self.width - self.beam_width + self.panel_gap) / 2,
-            self.angles[branch_number] - 90,
+        table = self._rot_table
+        shift = (self.width - self.beam_width + self.panel_gap) / 2
+        half_step = (self.width - self.beam_width) / 2
+        full_step = self.width - self.beam_width
+        point = (
+            np.asarray(branch_position, dtype=np.float64)
+            + shift * table[branch_number, 2]
         )
         if branch_position == 0:
-            point = end_point_of_line(
-                point,
-                (self.width - self.beam_width + self.panel_gap) / 2,
-                self.angles[branch_number] + 90,
-            )
+            point = point + shift * table[branch_number, 1]
         else:
-            point = end_point_of_line(
-                point,
-                self.panel_gap / 2,
-                self.angles[branch_number] + 90,
-            )
+            point = point + (self.panel_gap / 2) * table[branch_number, 1]
         for i in list(range(0, branch_number))[::-1]:
-            if i == 0:
-                point = end_point_of_line(
-                    point,
-                    (self.beam_width * 1 / self.ratio - self.beam_width) / 2,
-                    self.angles[i] + 270,
-                )
-            else:
-                point = end_point_of_line(
-                    point,
-                    self.beam_width * 1 / self.ratio - self.beam_width,
-                    self.angles[i] + 270,
-                )
-        point = end_point_of_line(point, self.radius, self.angles[branch_number] + 180)
-        return point
+            point = point + (half_step if i == 0 else full_step) * table[i, 2]
+        point = point + self.radius * table[branch_number, 3]
+        return tuple(point)
 
     def _get_new_ref_block(
         self, row_idx: int, old_ref_block: BuildingBlockShimYoshimora
@@ -657,31 +630,17 @@ class ShimTesselation:
         )
         return new_ref
 
-    def _draw_row(self, row_idx: int, center: tuple[float], size: int):
-        for j in range(size):
-            activated_branch = self._compute_activated_branch((row_idx, j))
-            buildingBlockShim = BuildingBlockShimYoshimora(
-                center,
-                self.radius,
-                self.length,
-                self.angle,
-                self.ratio,
-                self.margin,
-                self.beam_count,
-                self.panel_gap,
-                self.beam_gap,
-                activated_branch,
-                self.beam_length,
-                self.beam_width,
-                self.drawing,
-            )
-            buildingBlockShim()
-            center = end_point_of_line(
-                center, buildingBlockShim._get_branch_length(0) + self.radius, 0
-            )
-            center = self._get_center_position(3, center)
+    def _collect_blocks(self) -> list[BuildingBlockShimYoshimora]:
+        """Build every block of the grid without drawing anything.
 
-    def _draw_shim_sheet(self) -> None:
+        The center of each block only depends on the previous block of its
+        row, so the grid walk stays serial but is cheap; the expensive
+        vertex generation is deferred to _collect_entities.
+
+        Returns:
+            list[BuildingBlockShimYoshimora]: one block per grid cell
+        """
+        blocks = []
         ref_block = BuildingBlockShimYoshimora(
             self.center,
             self.radius,
@@ -692,14 +651,89 @@ class ShimTesselation:
             self.beam_count,
             self.panel_gap,
             self.beam_gap,
-            [True for _ in range(6)],
+            (True,) * 6,
             self.beam_length,
             self.beam_width,
             self.drawing,
         )
         for i in range(self.size[0]):
-            self._draw_row(i, ref_block.center, self.size[1])
+            center = ref_block.center
+            for j in range(self.size[1]):
+                block = BuildingBlockShimYoshimora(
+                    center,
+                    self.radius,
+                    self.length,
+                    self.angle,
+                    self.ratio,
+                    self.margin,
+                    self.beam_count,
+                    self.panel_gap,
+                    self.beam_gap,
+                    self._compute_activated_branch((i, j)),
+                    self.beam_length,
+                    self.beam_width,
+                    self.drawing,
+                )
+                blocks.append(block)
+                center = end_point_of_line(
+                    center, block._get_branch_length(0) + self.radius, 0
+                )
+                center = self._get_center_position(3, center)
             ref_block = self._get_new_ref_block(i + 1, ref_block)
+        return blocks
+
+    def _block_entities(
+        self, block: BuildingBlockShimYoshimora
+    ) -> list[tuple[str, list[tuple[float]]]]:
+        """Get the entities of a block from a translated geometry template.
+
+        All blocks sharing an activation pattern have the same geometry up
+        to translation, so the vertices are generated once at the origin
+        per pattern and shifted to each block center afterwards.
+
+        Args:
+            block (BuildingBlockShimYoshimora): block to get the entities of
+
+        Returns:
+            list[tuple[str, list[tuple[float]]]]: ("line" | "polyline", points) pairs
+        """
+        template = self._templates.get(block.activated_branch)
+        if template is None:
+            origin_block = BuildingBlockShimYoshimora(
+                (0, 0),
+                self.radius,
+                self.length,
+                self.angle,
+                self.ratio,
+                self.margin,
+                self.beam_count,
+                self.panel_gap,
+                self.beam_gap,
+                block.activated_branch,
+                self.beam_length,
+                self.beam_width,
+                self.drawing,
+            )
+            template = [
+                (kind, np.asarray(points, dtype=np.float64))
+                for kind, points in origin_block._collect_entities()
+            ]
+            self._templates[block.activated_branch] = template
+        offset = np.asarray(block.center, dtype=np.float64)
+        return [(kind, points + offset) for kind, points in template]
+
+    def _draw_shim_sheet(self) -> None:
+        blocks = self._collect_blocks()
+        if self.workers is not None and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                entity_lists = list(
+                    pool.map(BuildingBlockShimYoshimora._collect_entities, blocks)
+                )
+        else:
+            entity_lists = [self._block_entities(block) for block in blocks]
+        for entities in entity_lists:
+            add_entities(self.drawing, entities)
+        self.drawing.save()
 
     def __call__(self) -> None:
         self._draw_shim_sheet()
@@ -727,15 +761,17 @@ if __name__ == "__main__":
         **pattern_settings, drawing=dxf.drawing("test/shim_center_part.dxf")
     )
     shimCenterPart()
+    shimCenterPart.drawing.save()
 
     shimSep = ShimSep(**pattern_settings, drawing=dxf.drawing("test/shim_sep.dxf"))
-    shimSep.drawing.save()
     shimSep()
+    shimSep.drawing.save()
 
     shimBuildingBlock = BuildingBlockShimYoshimora(
         **pattern_settings, drawing=dxf.drawing("test/shim_building_block.dxf")
     )
     shimBuildingBlock()
+    shimBuildingBlock.drawing.save()
 
     shimTesselation = ShimTesselation(
         **pattern_settings,